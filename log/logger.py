@@ -8,15 +8,43 @@ Central application logger using Python's standard logging module.
 
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Any
 
+from log.buffered_file_handler import BufferedFileHandler
 from log.rtsp_sanitizing_filter import RtspSanitizingFilter
 from utils.config import Config
 from utils.singleton import Singleton
 
 
+class CachedTimestampFormatter(logging.Formatter):
+    """
+    Formatter that caches the formatted timestamp at one-second
+    granularity so at most one strftime call runs per wall-clock second,
+    no matter how many records arrive in that second.
+    """
+
+    def __init__(self, fmt: str, datefmt: str) -> None:
+        super().__init__(fmt=fmt, datefmt=datefmt)
+        self._cached_second: int = -1
+        self._cached_asctime: str = ""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_asctime = time.strftime(
+                datefmt or self.datefmt,
+                time.localtime(second),
+            )
+            self._cached_second = second
+        return self._cached_asctime
+
+
 class Logger(Singleton):
     """
     Singleton wrapper around a configured logging.Logger instance.
@@ -33,6 +61,7 @@ class Logger(Singleton):
 
     _initialized: bool
     _logger: logging.Logger
+    _listener: QueueListener
     log_dir: Path
     log_file_path: Path
 
@@ -42,7 +71,7 @@ class Logger(Singleton):
             return
 
         conf = Config()
-        log_path_value = conf["log_path"]
+        log_path_value = conf.log_path
 
         # Ensure we have a Path object for the log directory
         self.log_dir = Path(log_path_value)
@@ -71,32 +100,49 @@ class Logger(Singleton):
     def _configure_handlers(self) -> None:
         """
         Configure file and console handlers, formatter, and filters.
+
+        Records are pushed onto an unbounded queue by the logging caller
+        and drained by a background listener thread, so producer threads
+        (camera recorders, retention manager) never block on file I/O.
         """
 
         # Common formatter with timestamp and level
-        formatter = logging.Formatter(
+        formatter = CachedTimestampFormatter(
             fmt="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S",
         )
 
-        # File handler
-        file_handler = logging.FileHandler(
-            filename=self.log_file_path,
-            encoding="utf-8",
-        )
+        # File handler; batches records and writes them with a single
+        # vectored syscall per flush instead of a write per record
+        file_handler = BufferedFileHandler(str(self.log_file_path))
         file_handler.setFormatter(formatter)
 
         # Console handler (stderr by default)
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
 
-        # RTSP sanitizing filter for both handlers
+        # RTSP sanitizing filter for both handlers. Attached to the
+        # sink handlers (not the queue handler) so sanitisation runs on
+        # the listener thread, off the logging caller's hot path.
         sanitizing_filter = RtspSanitizingFilter()
         file_handler.addFilter(sanitizing_filter)
         console_handler.addFilter(sanitizing_filter)
 
-        self._logger.addHandler(file_handler)
-        self._logger.addHandler(console_handler)
+        # Producers only pay for an enqueue; the listener thread does
+        # the formatting, filtering and writes.
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._listener = QueueListener(
+            log_queue,
+            file_handler,
+            console_handler,
+            respect_handler_level=True,
+        )
+        self._listener.start()
+
+        # Drain the queue before interpreter exit so no records are lost
+        atexit.register(self._listener.stop)
+
+        self._logger.addHandler(QueueHandler(log_queue))
 
     @property
     def logger(self) -> logging.Logger:
@@ -105,6 +151,16 @@ class Logger(Singleton):
         """
         return self._logger
 
+    def flush(self) -> None:
+        """
+        Flush any buffered log output to disk.
+
+        Called from the shutdown path so pending records are not lost
+        when the process exits.
+        """
+        for handler in self._listener.handlers:
+            handler.flush()
+
     # Convenience methods so callers can use Logger() directly
     # instead of Logger().logger.<level>(...).
 
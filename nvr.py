@@ -1,6 +1,5 @@
 import signal
 import threading
-import time
 from pathlib import Path
 
 from log.logger import Logger
@@ -10,7 +9,11 @@ from utils.config import Config
 
 
 def main() -> None:
-    # Create config
+    # Create config. This must stay the first thing main() does: the
+    # singleton is fully parsed and validated here, before any worker
+    # thread (or future forked worker, which would then inherit the
+    # parsed dict copy-on-write) is started, so workers never trigger
+    # a load themselves.
     conf = None
     try:
         conf = Config()
@@ -40,7 +43,7 @@ def main() -> None:
     # Start one CameraRecorder thread per enabled camera
     for camera in cameras:
         # Create a recorder
-        rec = CameraRecorder(camera["id"])
+        rec = CameraRecorder(conf, camera["id"])
 
         # Start it
         rec.start()
@@ -49,7 +52,7 @@ def main() -> None:
         recorders.append(rec)
 
     # Start retention manager
-    retention_manager = RetentionManager()
+    retention_manager = RetentionManager(conf)
     retention_manager.start()
 
     # Handle signals for clean shutdown
@@ -62,9 +65,8 @@ def main() -> None:
     signal.signal(signal.SIGINT, handle_signal)
     signal.signal(signal.SIGTERM, handle_signal)
 
-    # Wait for stop
-    while not stop_event.is_set():
-        time.sleep(1)
+    # Wait for stop (signal handler sets the event)
+    stop_event.wait()
 
     logger.info("Stopping recorders and retention manager...")
     retention_manager.stop()
@@ -77,6 +79,9 @@ def main() -> None:
 
     logger.info("All stopped")
 
+    # Make sure buffered log output reaches disk before exiting
+    Logger().flush()
+
 
 if __name__ == "__main__":
     main()
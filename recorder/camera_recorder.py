@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 from pathlib import Path
+import os
+import re
+import selectors
+import shlex
 import subprocess
 import threading
 import time
@@ -8,7 +12,21 @@ from typing import List, Tuple, Optional
 
 from utils.config import Config
 from log.logger import Logger
-from log.rtsp_sanitizing_filter import sanitize_rtsp_url
+from recorder.ffmpeg_log_writer import FfmpegLogWriter
+from log.rtsp_sanitizing_filter import sanitize_rtsp_url, sanitize_rtsp_url_bytes
+
+# Markers in ffmpeg output that indicate an auth problem, compiled into
+# one case-insensitive bytes pattern so each output block is scanned
+# with a single C-level search
+_AUTH_ERROR_PATTERN = re.compile(
+    rb"401 unauthorized"
+    rb"|403 forbidden"
+    rb"|authorization failed"
+    rb"|auth failed"
+    rb"|unauthorized"
+    rb"|authentication failed",
+    re.IGNORECASE,
+)
 
 
 class CameraRecorder(threading.Thread):
@@ -17,47 +35,55 @@ class CameraRecorder(threading.Thread):
     output into files and logging ffmpeg output to a per-camera log file.
     """
 
-    def __init__(self, id: str) -> None:
+    def __init__(self, config: Config, id: str) -> None:
         super().__init__(daemon=True)
 
-        self.global_conf: Config = Config()
+        # Shared, already-validated Config built at startup; treated as
+        # a frozen snapshot for the life of the thread
+        self.global_conf: Config = config
         self.camera_conf = self.global_conf.get_camera(id)
         self.stop_event = threading.Event()
-        self.proc: Optional[subprocess.Popen[str]] = None
+        self.proc: Optional[subprocess.Popen[bytes]] = None
 
         # Application logger
         self.logger = Logger().logger
 
+        # Shared background writer for the per-camera ffmpeg log
+        self.log_writer = FfmpegLogWriter()
+
         # Per-camera ffmpeg log file
-        self.log_dir = Path(self.global_conf.get(Config.KEY_LOG_PATH, "./logs"))
+        self.log_dir = Path(self.global_conf.log_path)
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.ffmpeg_log_path = (
             self.log_dir / f"{self.camera_conf[Config.KEY_CAMERA_NAME]}.ffmpeg.log"
         )
 
-    def build_ffmpeg_command(self) -> Tuple[List[str], str]:
-        """
-        Build the ffmpeg command and return (cmd_list, rtsp_url).
-        """
-        stream_output_path = Path(self.global_conf.stream_output_path)
+        # Cache the values that never change between restarts so
+        # build_ffmpeg_command does no config lookups or mkdir work
+        # on the restart loop.
         camera_name = self.camera_conf[Config.KEY_CAMERA_NAME]
         segment_seconds = self.global_conf.stream_segment_seconds
-        ffmpeg_bin = self.global_conf.get(Config.KEY_FFMPEG_BINARY, "ffmpeg")
+        ffmpeg_bin = self.global_conf.ffmpeg_binary
 
-        out_dir = stream_output_path / camera_name
+        out_dir = Path(self.global_conf.stream_output_path) / camera_name
         out_dir.mkdir(parents=True, exist_ok=True)
 
         # e.g. 20251122_203000_300s.mp4
         out_pattern = str(out_dir / f"%Y%m%d_%H%M%S_{segment_seconds}s.mp4")
 
-        rtsp_url: str = self.camera_conf[Config.KEY_CAMERA_RTSP_URL]
-
-        cmd: List[str] = [
+        # Prebuilt command with the RTSP URL spliced in per call
+        self._cmd_template: List[str] = [
             ffmpeg_bin,
+            # No per-frame progress spam and warnings-and-up only, so
+            # the output pipe carries a trickle instead of a stream;
+            # auth failures are errors and still come through
+            "-nostats",
+            "-loglevel",
+            "warning",
             "-rtsp_transport",
             "tcp",
             "-i",
-            rtsp_url,
+            "",  # rtsp_url placeholder
             "-an",
             "-c",
             "copy",
@@ -71,8 +97,32 @@ class CameraRecorder(threading.Thread):
             "1",
             out_pattern,
         ]
+        self._rtsp_url_index = self._cmd_template.index("-i") + 1
+
+        # The URL is already env-expanded by Config, so it can be
+        # validated and spliced into the command once here instead of
+        # on every restart iteration.
+        rtsp_url: str = self.camera_conf[Config.KEY_CAMERA_RTSP_URL]
+        self._rtsp_url = rtsp_url
+        self._rtsp_url_valid = bool(rtsp_url) and (
+            "{RTSP_USER}" not in rtsp_url and "{RTSP_PASSWORD}" not in rtsp_url
+        )
 
-        return cmd, rtsp_url
+        self._cmd: List[str] = self._cmd_template.copy()
+        self._cmd[self._rtsp_url_index] = rtsp_url
+
+        # Sanitised command string for the "Starting ffmpeg" log line,
+        # built once since the command never changes between restarts
+        self._safe_cmd_str = shlex.join(
+            sanitize_rtsp_url(part) if part.startswith("rtsp://") else part
+            for part in self._cmd
+        )
+
+    def build_ffmpeg_command(self) -> Tuple[List[str], str]:
+        """
+        Return the prebuilt ffmpeg command and its RTSP URL.
+        """
+        return self._cmd, self._rtsp_url
 
     def stop(self) -> None:
         """
@@ -97,98 +147,141 @@ class CameraRecorder(threading.Thread):
             )
             return
 
-        # Strings to look for in ffmpeg output that indicate an auth problem
-        auth_error_markers = [
-            "401 unauthorized",
-            "403 forbidden",
-            "authorization failed",
-            "auth failed",
-            "unauthorized",  # generic, keep lowercase check
-            "authentication failed",
-        ]
+        # URL validity was established once in __init__; a placeholder
+        # that never expanded will not fix itself, so do not retry.
+        if not self._rtsp_url_valid:
+            self.logger.error(
+                "[%s] Invalid RTSP URL after env expansion: %r",
+                camera_name,
+                self._rtsp_url,
+            )
+            return
 
         while not self.stop_event.is_set():
             cmd, rtsp_url = self.build_ffmpeg_command()
 
-            # Validate RTSP URL after env expansion
-            if (
-                not rtsp_url
-                or "{RTSP_USER}" in rtsp_url
-                or "{RTSP_PASSWORD}" in rtsp_url
-            ):
-                self.logger.info(
-                    "[%s] Invalid RTSP URL after env expansion: %r",
-                    camera_name,
-                    rtsp_url,
-                )
-                time.sleep(10)
-                continue
-
             auth_error_detected = False
 
             try:
-                # Build a sanitised command string for logging (extra safety;
-                # main logger will also sanitize via RtspSanitizingFilter)
-                safe_cmd: List[str] = []
-                for part in cmd:
-                    part_str = str(part)
-                    if part_str.startswith("rtsp://"):
-                        safe_cmd.append(sanitize_rtsp_url(part_str))
-                    else:
-                        safe_cmd.append(part_str)
-
+                # Command string was sanitised once in __init__ (the
+                # main logger would also scrub it via RtspSanitizingFilter)
                 self.logger.info(
                     "[%s] Starting ffmpeg: %s",
                     camera_name,
-                    " ".join(safe_cmd),
+                    self._safe_cmd_str,
                 )
 
-                # Start ffmpeg, capturing stdout+stderr
+                # Start ffmpeg, capturing stdout+stderr as raw bytes;
+                # reads go through os.read below so no Python-side
+                # buffering is wanted on the pipe
                 self.proc = subprocess.Popen(
                     cmd,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
+                    bufsize=0,
                 )
 
                 log_ffmpeg = self.camera_conf[Config.KEY_CAMERA_LOG_FFMPEG]
                 assert self.proc.stdout is not None
                 with self.proc.stdout as proc_out:
-                    # Open file only if logging is enabled
-                    log_file = (
-                        open(
-                            self.ffmpeg_log_path,
-                            "a",
-                            buffering=1,
-                            encoding="utf-8",
-                        )
-                        if log_ffmpeg
-                        else None
-                    )
+                    # Log path only if logging is enabled; writes go
+                    # through the shared background writer thread
+                    log_path = str(self.ffmpeg_log_path) if log_ffmpeg else None
+
+                    # Non-blocking reads driven by a selector, so the
+                    # loop can notice stop_event even while ffmpeg is
+                    # silent (e.g. a wedged stream)
+                    out_fd = proc_out.fileno()
+                    os.set_blocking(out_fd, False)
+                    selector = selectors.DefaultSelector()
+                    selector.register(out_fd, selectors.EVENT_READ)
+
+                    # A pidfd becomes readable when the child exits, so
+                    # the selector wakes on termination immediately
+                    # instead of on the next timeout tick (stdout EOF
+                    # then ends the loop). Not available everywhere.
+                    pidfd = -1
+                    if hasattr(os, "pidfd_open"):
+                        try:
+                            pidfd = os.pidfd_open(self.proc.pid)
+                            selector.register(pidfd, selectors.EVENT_READ)
+                        except OSError:
+                            pidfd = -1
+
+                    # Partial trailing line carried between chunks so the
+                    # sanitiser and auth scan never see a split line
+                    carry = b""
+
+                    # Group-commit buffer for the log file: sanitised
+                    # blocks accumulate and are written once the batch
+                    # reaches 64 KiB or once per second, whichever first
+                    write_buffer = bytearray()
+                    last_write = time.monotonic()
 
                     try:
-                        for line in proc_out:
-                            if line is None:
-                                break
-
-                            raw_line = line.rstrip("\n")
-                            safe_line = sanitize_rtsp_url(raw_line)
-
-                            # Write to per-camera log file only when enabled
-                            if log_file is not None:
-                                log_file.write(safe_line + "\n")
-
-                            # Detect auth errors in ffmpeg output (case-insensitive)
-                            lower = raw_line.lower()
-                            if any(marker in lower for marker in auth_error_markers):
+                        eof = False
+                        while not eof and not self.stop_event.is_set():
+                            ready = selector.select(timeout=0.5)
+
+                            # Drain whatever is ready
+                            while ready:
+                                try:
+                                    chunk = os.read(out_fd, 65536)
+                                except BlockingIOError:
+                                    break
+
+                                if not chunk:
+                                    eof = True
+                                    break
+
+                                data = carry + chunk
+
+                                # Only process up to the last complete line;
+                                # keep the remainder for the next chunk
+                                newline_index = data.rfind(b"\n")
+                                if newline_index < 0:
+                                    carry = data
+                                    continue
+
+                                block = data[: newline_index + 1]
+                                carry = data[newline_index + 1 :]
+
+                                # Buffer for the per-camera log file only
+                                # when logging is enabled
+                                if log_path is not None:
+                                    write_buffer += sanitize_rtsp_url_bytes(block)
+
+                                # Detect auth errors in ffmpeg output
+                                # (case-insensitive); once seen there is
+                                # no point rescanning the remaining drain
+                                if not auth_error_detected and _AUTH_ERROR_PATTERN.search(
+                                    block
+                                ):
+                                    auth_error_detected = True
+
+                            # Hand a whole batch to the writer thread at
+                            # most once per second (or per 64 KiB)
+                            if log_path is not None and write_buffer:
+                                now = time.monotonic()
+                                if len(write_buffer) >= 65536 or now - last_write >= 1.0:
+                                    self.log_writer.write(log_path, bytes(write_buffer))
+                                    write_buffer.clear()
+                                    last_write = now
+
+                        # Flush any trailing partial line
+                        if carry:
+                            if log_path is not None:
+                                write_buffer += sanitize_rtsp_url_bytes(carry) + b"\n"
+                            if not auth_error_detected and _AUTH_ERROR_PATTERN.search(
+                                carry
+                            ):
                                 auth_error_detected = True
-
-                            if self.stop_event.is_set():
-                                break
                     finally:
-                        if log_file is not None:
-                            log_file.close()
+                        selector.close()
+                        if pidfd != -1:
+                            os.close(pidfd)
+                        if log_path is not None and write_buffer:
+                            self.log_writer.write(log_path, bytes(write_buffer))
 
                 # Wait for process to exit (in case stdout loop ended early)
                 ret = self.proc.wait()
@@ -0,0 +1,97 @@
+"""
+Single background writer thread for the per-camera ffmpeg log files.
+
+Recorder threads enqueue already-sanitised byte chunks and carry on
+pumping ffmpeg output; this writer owns the file handles and performs
+the actual disk writes, so producer threads never block on log I/O.
+"""
+
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from utils.singleton import Singleton
+
+
+class FfmpegLogWriter(Singleton):
+    """
+    Shared writer draining (path, bytes) items from a queue onto disk.
+
+    One file handle is kept open per log path (one per camera) for the
+    life of the process; close() drains outstanding items and closes
+    the handles, and is registered with atexit.
+    """
+
+    _initialized: bool
+
+    def __init__(self) -> None:
+        # Protect against reinitialization in a singleton.
+        if getattr(self, "_initialized", False):
+            return
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._files: Dict[str, BinaryIO] = {}
+        self._thread = threading.Thread(
+            target=self._drain,
+            name="ffmpeg-log-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+        atexit.register(self.close)
+
+        self._initialized = True
+
+    def write(self, path: str, data: bytes) -> None:
+        """
+        Queue `data` for appending to the log file at `path`.
+        Returns immediately; the writer thread performs the I/O.
+        """
+        if data:
+            self._queue.put((path, data))
+
+    def _drain(self) -> None:
+        while True:
+            item: Optional[Tuple[str, bytes]] = self._queue.get()
+
+            # Sentinel from close(): everything queued before it has
+            # already been written
+            if item is None:
+                break
+
+            path, data = item
+
+            try:
+                f = self._files.get(path)
+                if f is None:
+                    # Unbuffered: each queued item is already a batch
+                    f = open(path, "ab", buffering=0)
+                    self._files[path] = f
+
+                f.write(data)
+            except OSError:
+                # Dropping ffmpeg log output is preferable to killing
+                # the writer thread; the application log still records
+                # recorder lifecycle events.
+                continue
+
+    def close(self) -> None:
+        """
+        Drain outstanding items, stop the writer thread and close all
+        log file handles. Safe to call more than once.
+        """
+        if not self._thread.is_alive():
+            return
+
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+        for f in self._files.values():
+            try:
+                f.close()
+            except OSError:
+                pass
+        self._files.clear()
@@ -1,95 +1,215 @@
+import os
 import threading
 import time
 import shutil
 from pathlib import Path
-from datetime import datetime, timedelta
+from typing import Callable, Optional
 
 from log.logger import Logger
 from utils.config import Config
 
 
+def _segment_timestamp_prefix(name: str) -> str | None:
+    """
+    Return the fixed-width '%Y%m%d_%H%M%S' prefix of a segment filename
+    (e.g. '20251122_203000' from '20251122_203000_300s.mp4'), or None if
+    the name does not follow the recorder's naming scheme.
+
+    Because the format is zero-padded, prefixes compare chronologically
+    as plain strings, so expiry can be decided without a stat syscall.
+    """
+    if len(name) >= 16 and name[8] == "_" and name[:8].isdigit() and name[9:15].isdigit():
+        return name[:15]
+    return None
+
+
 class RetentionManager(threading.Thread):
-    def __init__(self):
+    def __init__(self, config: Config):
         super().__init__(daemon=True)
-        self.conf = Config()
+        self.conf = config
         self.stop_event = threading.Event()
         self.logger = Logger().logger
 
     def stop(self) -> None:
         self.stop_event.set()
 
+    def _sweep(
+        self,
+        root: Path,
+        cutoff_str: str,
+        cutoff_ts: float,
+        handle_expired: Callable[[os.DirEntry, str], None],
+    ) -> Optional[float]:
+        """
+        Walk each camera directory under `root` and call
+        `handle_expired(entry, camera_dir_name)` for every expired .mp4.
+
+        os.scandir is used instead of glob: DirEntry.is_dir reads the
+        dirent type and DirEntry.stat is served from the readdir data
+        where possible, roughly halving the syscalls per file and
+        avoiding a Path allocation per entry. Expiry is decided from the
+        filename timestamp when available, falling back to mtime.
+
+        Returns the epoch timestamp of the oldest surviving segment (or
+        None if nothing survived), so the caller can sleep until that
+        file is actually due instead of re-scanning on a fixed cadence.
+        """
+        min_prefix: Optional[str] = None
+        min_mtime: Optional[float] = None
+
+        try:
+            cam_dirs = os.scandir(root)
+        except FileNotFoundError:
+            return None
+
+        with cam_dirs:
+            for cam_dir in cam_dirs:
+                if not cam_dir.is_dir(follow_symlinks=False):
+                    continue
+
+                with os.scandir(cam_dir.path) as files:
+                    for file in files:
+                        if not file.name.endswith(".mp4"):
+                            continue
+
+                        prefix = _segment_timestamp_prefix(file.name)
+
+                        try:
+                            if prefix is not None:
+                                expired = prefix < cutoff_str
+                                if not expired and (
+                                    min_prefix is None or prefix < min_prefix
+                                ):
+                                    min_prefix = prefix
+                            else:
+                                mtime = file.stat().st_mtime
+                                expired = mtime < cutoff_ts
+                                if not expired and (
+                                    min_mtime is None or mtime < min_mtime
+                                ):
+                                    min_mtime = mtime
+
+                            if expired:
+                                handle_expired(file, cam_dir.name)
+                        except FileNotFoundError:
+                            # File may be gone already
+                            pass
+                        except OSError as e:
+                            # Log other I/O problems (permissions, network issues, etc.)
+                            self.logger.info(
+                                f"[Retention] Failed to process {file.path}: {e}"
+                            )
+
+        earliest = min_mtime
+        if min_prefix is not None:
+            try:
+                prefix_ts = time.mktime(time.strptime(min_prefix, "%Y%m%d_%H%M%S"))
+            except (ValueError, OverflowError):
+                prefix_ts = None
+            if prefix_ts is not None and (earliest is None or prefix_ts < earliest):
+                earliest = prefix_ts
+        return earliest
+
     def run(self) -> None:
         retention_days = self.conf.stream_retention_days
         backup_retention_days = self.conf.stream_backup_retention_days
         stream_output_path = Path(self.conf.stream_output_path)
         backup_path = Path(self.conf.stream_backup_output_path)
-        check_interval_seconds = 600  # every 10 minutes
+
+        # Deadline-driven sleep bounds: wake when the next segment is
+        # actually due, but no more than once a minute and at least
+        # hourly (to notice files that appear with already-old mtimes)
+        min_sleep_seconds = 60
+        max_sleep_seconds = 3600
+
+        # When primary and backup live on the same filesystem a move is
+        # a single atomic rename; only fall back to shutil.move (which
+        # stats both sides and may copy) across filesystems.
+        try:
+            same_fs = (
+                os.stat(stream_output_path).st_dev == os.stat(backup_path).st_dev
+            )
+        except OSError:
+            same_fs = False
+
+        # Backup camera directories already created this run, so mkdir
+        # is paid once per camera rather than once per expired file
+        created_backup_dirs: set = set()
+
+        def move_to_backup(file: os.DirEntry, cam_name: str) -> None:
+            backup_cam_dir = backup_path / cam_name
+            if cam_name not in created_backup_dirs:
+                backup_cam_dir.mkdir(parents=True, exist_ok=True)
+                created_backup_dirs.add(cam_name)
+
+            dest = backup_cam_dir / file.name
+
+            if same_fs:
+                # Atomic rename, one syscall
+                os.replace(file.path, str(dest))
+            else:
+                # shutil.move handles cross-filesystem moves
+                shutil.move(file.path, str(dest))
+
+            self.logger.info(f"[Retention] Moved old file to backup: {dest}")
+
+        def delete_expired(file: os.DirEntry, cam_name: str) -> None:
+            os.unlink(file.path)
+            self.logger.info(f"[Retention] Deleted expired backup file: {file.path}")
 
         self.logger.info("Retention manager started")
 
         while not self.stop_event.is_set():
-            now = datetime.now()
+            now_ts = time.time()
 
-            # Cutoff to move from primary to backup
-            move_delta = timedelta(days=retention_days)
-            move_cutoff = now - move_delta
+            # Cutoff to move from primary to backup (epoch seconds, so
+            # mtimes compare directly without datetime objects per file)
+            move_cutoff_ts = now_ts - retention_days * 86400
 
             # Cutoff to delete from backup:
             #   max lifetime = retention_days in primary + backup_retention_days in backup
-            delete_cutoff = now - timedelta(days=retention_days + backup_retention_days)
-
-            # 1) Move old files from stream_output_path -> backup_path
-            for cam_dir in stream_output_path.glob("*"):
-                if not cam_dir.is_dir():
-                    continue
-
-                backup_cam_dir = backup_path / cam_dir.name
-                backup_cam_dir.mkdir(parents=True, exist_ok=True)
-
-                for file in cam_dir.glob("*.mp4"):
-                    try:
-                        mtime = datetime.fromtimestamp(file.stat().st_mtime)
-                        if mtime < move_cutoff:
-                            dest = backup_cam_dir / file.name
+            delete_cutoff_ts = now_ts - (retention_days + backup_retention_days) * 86400
 
-                            # shutil.move handles cross-filesystem moves
-                            shutil.move(str(file), str(dest))
+            # String forms of the cutoffs for comparing against the
+            # strftime-encoded segment filenames (no stat needed)
+            move_cutoff_str = time.strftime(
+                "%Y%m%d_%H%M%S", time.localtime(move_cutoff_ts)
+            )
+            delete_cutoff_str = time.strftime(
+                "%Y%m%d_%H%M%S", time.localtime(delete_cutoff_ts)
+            )
 
-                            self.logger.info(
-                                f"[Retention] Moved old file to backup: {dest}"
-                            )
-                    except FileNotFoundError as e:
-                        # File may be gone already
-                        self.logger.info(
-                            f"[Retention] Failed to move {file} to backup: {e}, FileNotFoundError"
-                        )
-                    except OSError as e:
-                        # Log other I/O problems (permissions, network issues, etc.)
-                        self.logger.info(
-                            f"[Retention] Failed to move {file} to backup: {e}"
-                        )
+            # 1) Move old files from stream_output_path -> backup_path
+            earliest_primary = self._sweep(
+                stream_output_path, move_cutoff_str, move_cutoff_ts, move_to_backup
+            )
 
             # 2) Delete very old files from backup_path
-            for cam_dir in backup_path.glob("*"):
-                if not cam_dir.is_dir():
-                    continue
-
-                for file in cam_dir.glob("*.mp4"):
-                    try:
-                        mtime = datetime.fromtimestamp(file.stat().st_mtime)
-                        # Delete only once the file is older than
-                        # retention_days + backup_retention_days
-                        if mtime < delete_cutoff:
-                            file.unlink()
-                            self.logger.info(
-                                f"[Retention] Deleted expired backup file: {file}"
-                            )
-                    except FileNotFoundError:
-                        # File may be gone already
-                        pass
-
-            # Sleep loop, but allow timely stop
-            for _ in range(check_interval_seconds):
-                if self.stop_event.is_set():
-                    break
-                time.sleep(1)
+            earliest_backup = self._sweep(
+                backup_path, delete_cutoff_str, delete_cutoff_ts, delete_expired
+            )
+
+            # Sleep until the oldest surviving file crosses its cutoff
+            # rather than re-scanning every cycle regardless
+            next_due = None
+            if earliest_primary is not None:
+                next_due = earliest_primary + retention_days * 86400
+            if earliest_backup is not None:
+                backup_due = (
+                    earliest_backup
+                    + (retention_days + backup_retention_days) * 86400
+                )
+                if next_due is None or backup_due < next_due:
+                    next_due = backup_due
+
+            if next_due is None:
+                sleep_seconds = max_sleep_seconds
+            else:
+                sleep_seconds = min(
+                    max(next_due - time.time(), min_sleep_seconds),
+                    max_sleep_seconds,
+                )
+
+            # Single blocking wait; returns early (True) when stop is set
+            if self.stop_event.wait(sleep_seconds):
+                break
@@ -2,12 +2,23 @@ import threading
 
 
 class Singleton:
+    # No instance state of its own; keeps subclasses free to declare
+    # __slots__ without inheriting a __dict__
+    __slots__ = ()
+
+    # One instance per subclass, keyed by class. A plain dict.get on
+    # the base class is a single lookup on the hot path, unlike
+    # hasattr(cls, "_instance") which walks the MRO and builds an
+    # AttributeError on every miss.
+    _instances: dict = {}
     _instance_lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs):
-        # Each subclass gets its own instance
-        if not hasattr(cls, "_instance"):
-            with cls._instance_lock:
-                if not hasattr(cls, "_instance"):
-                    cls._instance = super().__new__(cls)
-        return cls._instance
+        instance = Singleton._instances.get(cls)
+        if instance is None:
+            with Singleton._instance_lock:
+                instance = Singleton._instances.get(cls)
+                if instance is None:
+                    instance = super().__new__(cls)
+                    Singleton._instances[cls] = instance
+        return instance